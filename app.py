@@ -1,12 +1,15 @@
-import math
+import gzip
+import hashlib
 import re
 from collections import Counter, defaultdict
+from functools import lru_cache, wraps
+from itertools import chain
 
+import numpy as np
 import pandas as pd
-from flask import Flask, render_template, request, jsonify
+from flask import Flask, Response, render_template, request, jsonify
 from sklearn.decomposition import PCA
-from sklearn.cluster import KMeans
-from sklearn.preprocessing import LabelEncoder
+from sklearn.cluster import MiniBatchKMeans
 
 app = Flask(__name__)
 
@@ -14,6 +17,16 @@ app = Flask(__name__)
 # ------------------------------
 # Data loading and normalization
 # ------------------------------
+_ADAPT_SPLIT_RE = re.compile(r'[;,/]\s*')
+_TOKEN_RE = re.compile(r'[a-z0-9]{3,}')
+_STOP_TOKENS = frozenset({'unknown'})
+
+
+def _split_adaptations(text: str) -> list[str]:
+    parts = _ADAPT_SPLIT_RE.split(str(text))
+    return [p.strip() for p in parts if p and p.lower() != 'unknown']
+
+
 def _normalize_columns(frame: pd.DataFrame) -> pd.DataFrame:
     frame = frame.copy()
     # Standardize column names (strip and collapse spaces)
@@ -59,65 +72,125 @@ def _normalize_columns(frame: pd.DataFrame) -> pd.DataFrame:
         frame['Vegetable'] = 'Unknown'
         veg_source_col = 'Vegetable'
 
-    def _to_yes_no(val: str) -> str:
-        v = (val or '').strip().lower()
-        if v in {'y', 'yes', 'true', '1'}:
-            return 'Yes'
-        if v in {'n', 'no', 'false', '0'}:
-            return 'No'
-        # Treat any non-empty text as Yes; Unknown/empty as No
-        if v and v != 'unknown':
-            return 'Yes'
-        return 'No'
-
-    frame['VegetableFlag'] = frame[veg_source_col].apply(_to_yes_no)
+    # Explicit no-values and Unknown/empty map to No; yes-values and any other text map to Yes
+    falsy = {'n', 'no', 'false', '0', 'unknown', ''}
+    veg_values = frame[veg_source_col].astype(str).str.strip().str.lower()
+    frame['VegetableFlag'] = np.where(veg_values.isin(falsy), 'No', 'Yes')
 
     # Build Usage tags from boolean columns when present
-    def _to_bool(val: str) -> bool:
-        v = (val or '').strip().lower()
-        return v in {'1', 'y', 'yes', 'true'}
-
-    usage_tags = []
-    for _, row in frame.iterrows():
-        tags = []
-        try:
-            if _to_bool(str(row.get('Vegetable', '0'))):
-                tags.append('Vegetable')
-            if _to_bool(str(row.get('Fruit', '0'))):
-                tags.append('Fruits')
-            if _to_bool(str(row.get('Medicinal Plant', '0'))):
-                tags.append('Medicinal')
-            if _to_bool(str(row.get('Commercial Crop', '0'))):
-                tags.append('Commercial')
-            if _to_bool(str(row.get('Ornamental Plant', '0'))):
-                tags.append('Ornamental')
-        except Exception:
-            tags = []
-        usage_tags.append(tags)
-    frame['UsageTags'] = usage_tags
-    frame['Usage'] = frame['UsageTags'].apply(lambda tags: '; '.join(tags) if tags else 'Unknown')
+    usage_sources = ['Vegetable', 'Fruit', 'Medicinal Plant', 'Commercial Crop', 'Ornamental Plant']
+    usage_labels = np.array(['Vegetable', 'Fruits', 'Medicinal', 'Commercial', 'Ornamental'])
+    truthy = {'1', 'y', 'yes', 'true'}
+    flags = np.column_stack(
+        [frame[c].astype(str).str.strip().str.lower().isin(truthy).to_numpy() for c in usage_sources]
+    )
+    frame['UsageTags'] = [usage_labels[row].tolist() for row in flags]
+    frame['Usage'] = ['; '.join(tags) if tags else 'Unknown' for tags in frame['UsageTags']]
+
+    # Split adaptations into tokens once; the chart routes reuse them on every request
+    frame['AdaptTokens'] = [_split_adaptations(text) for text in frame['Special Adaptations']]
+    frame['LoweredAdapt'] = frame['Special Adaptations'].astype(str).str.lower()
 
     return frame
 
 
-df = pd.read_csv('Crop_dashboard Kerala.csv').fillna('Unknown')
+# Every column is text (flags included); skip per-column type inference
+df = pd.read_csv('Crop_dashboard Kerala.csv', dtype=str).fillna('Unknown')
 df = _normalize_columns(df)
 
+# Trait columns (which include every filter column except Plant) are stored as categoricals,
+# so isin/value_counts/groupby and the encoding below work on integer codes
+TRAIT_COLS = [
+    'Root',
+    'Type',
+    'Stem / Growth Form',
+    'Leaf Traits',
+    'Reproductive Traits',
+    'Stress Tolerance',
+    'Special Adaptations',
+    'VegetableFlag',
+]
+
+for _col in TRAIT_COLS:
+    df[_col] = df[_col].astype('category')
+
 
 # ------------------------------
 # Helpers and precomputations
 # ------------------------------
-def get_plant_category(row: pd.Series) -> str:
-    stem = str(row.get('Stem / Growth Form', 'Unknown')).lower()
-    if 'tree' in stem:
-        return 'Tree'
-    if 'shrub' in stem:
-        return 'Shrub'
-    if 'herb' in stem:
-        return 'Herb'
-    if 'vine' in stem or 'climber' in stem:
-        return 'Vine'
-    return 'Other'
+def get_plant_categories(frame: pd.DataFrame) -> np.ndarray:
+    stem = frame['Stem / Growth Form'].astype(str).str.lower()
+    # First matching condition wins, in the same order as the original per-row checks
+    return np.select(
+        [
+            stem.str.contains('tree'),
+            stem.str.contains('shrub'),
+            stem.str.contains('herb'),
+            stem.str.contains('vine|climber'),
+        ],
+        ['Tree', 'Shrub', 'Herb', 'Vine'],
+        default='Other',
+    )
+
+
+# Bodies smaller than this are not worth the gzip header and decode cost
+GZIP_MIN_SIZE = 1024
+
+
+def _prepare_json(payload) -> dict:
+    # Serialize once; keep identity and gzip bodies plus an ETag for conditional requests
+    body = app.json.dumps(payload, separators=(',', ':')).encode('utf-8')
+    return {
+        'body': body,
+        'gzip': gzip.compress(body, compresslevel=6) if len(body) >= GZIP_MIN_SIZE else None,
+        'etag': hashlib.sha1(body).hexdigest(),
+    }
+
+
+def _prepared_response(prepared: dict) -> Response:
+    if prepared['gzip'] is not None and request.accept_encodings['gzip']:
+        response = Response(prepared['gzip'], mimetype='application/json')
+        response.headers['Content-Encoding'] = 'gzip'
+        response.set_etag(prepared['etag'] + '-gz')
+    else:
+        response = Response(prepared['body'], mimetype='application/json')
+        response.set_etag(prepared['etag'])
+    response.vary.add('Accept-Encoding')
+    return response.make_conditional(request)
+
+
+def _category_counts(series: pd.Series) -> dict:
+    # Count a categorical's integer codes directly; only observed categories are reported
+    categories = series.cat.categories
+    codes = series.cat.codes.to_numpy()
+    counts = np.bincount(codes[codes >= 0], minlength=len(categories))
+    observed = np.flatnonzero(counts)
+    return dict(zip(categories[observed].tolist(), counts[observed].tolist()))
+
+
+def cached_json(route):
+    # Filter-driven routes return plain payloads; memoize the serialized response per filter key
+    @lru_cache(maxsize=256)
+    def prepare(key: tuple) -> dict:
+        return _prepare_json(route())
+
+    @wraps(route)
+    def wrapper():
+        return _prepared_response(prepare(_filter_key()))
+
+    return wrapper
+
+
+def _top_adapt_tokens(index: np.ndarray, k: int) -> list[str]:
+    # Gather the flat token codes of the given rows, in row then token order
+    lengths = ADAPT_TOKEN_LENGTHS[index]
+    shift = np.repeat(ADAPT_TOKEN_STARTS[index] - (np.cumsum(lengths) - lengths), lengths)
+    codes = ADAPT_TOKEN_CODES[shift + np.arange(lengths.sum())]
+    # Re-factorize so ties break by first appearance, matching Counter.most_common
+    local_codes, uniques = pd.factorize(codes)
+    counts = np.bincount(local_codes, minlength=len(uniques))
+    top = np.argsort(-counts, kind='stable')[:k]
+    return ADAPT_TOKEN_LABELS[uniques[top]].tolist()
 
 
 def _parse_list_arg(arg_name: str) -> list:
@@ -129,41 +202,46 @@ def _parse_list_arg(arg_name: str) -> list:
     return values
 
 
-def apply_filters(source: pd.DataFrame) -> pd.DataFrame:
-    filtered = source
+# (query arg, column) pairs for the plain membership filters, in evaluation order
+FILTER_COLUMNS = [
+    ('plants', 'Plant'),
+    ('root', 'Root'),
+    ('type', 'Type'),
+    ('growth_form', 'Stem / Growth Form'),
+    ('stress_tolerance', 'Stress Tolerance'),
+    ('vegetable', 'VegetableFlag'),
+]
 
-    selected_plants = _parse_list_arg('plants')
-    if selected_plants:
-        filtered = filtered[filtered['Plant'].isin(selected_plants)]
 
-    roots = _parse_list_arg('root')
-    if roots:
-        filtered = filtered[filtered['Root'].isin(roots)]
+def _filter_key() -> tuple:
+    # Frozensets are hashable and order-insensitive, so equal selections share a cache entry
+    # and double as hash-based membership sets for isin
+    key = [frozenset(_parse_list_arg(arg)) for arg, _ in FILTER_COLUMNS]
+    key.append(frozenset(u.strip().lower() for u in _parse_list_arg('usage')))
+    return tuple(key)
 
-    types = _parse_list_arg('type')
-    if types:
-        filtered = filtered[filtered['Type'].isin(types)]
 
-    growth_forms = _parse_list_arg('growth_form')
-    if growth_forms:
-        filtered = filtered[filtered['Stem / Growth Form'].isin(growth_forms)]
+@lru_cache(maxsize=256)
+def _filtered_index(key: tuple) -> np.ndarray:
+    mask = np.ones(len(df), dtype=bool)
+    for (_, col), values in zip(FILTER_COLUMNS, key):
+        if values:
+            mask &= df[col].isin(values).to_numpy()
 
-    stress_tolerances = _parse_list_arg('stress_tolerance')
-    if stress_tolerances:
-        filtered = filtered[filtered['Stress Tolerance'].isin(stress_tolerances)]
+    wanted = key[-1]
+    if wanted:
+        cols = [i for i, u in enumerate(USAGE_COLS) if u.lower() in wanted]
+        mask &= USAGE_MATRIX[:, cols].any(axis=1)
 
-    vegetables = _parse_list_arg('vegetable')
-    if vegetables:
-        filtered = filtered[filtered['VegetableFlag'].isin(vegetables)]
+    # Row positions are cheaper to take than re-applying a boolean mask; the cached
+    # array is shared between requests
+    index = np.flatnonzero(mask)
+    index.flags.writeable = False
+    return index
 
-    usage_vals = _parse_list_arg('usage')
-    if usage_vals:
-        wanted = {u.strip().lower() for u in usage_vals}
-        def any_usage(tags):
-            return any((t.lower() in wanted) for t in (tags or []))
-        filtered = filtered[filtered['UsageTags'].apply(any_usage)]
 
-    return filtered
+def apply_filters() -> pd.DataFrame:
+    return df.take(_filtered_index(_filter_key()))
 
 
 # Precompute filter options and plant list
@@ -176,52 +254,104 @@ FILTER_OPTIONS = {
     'usage': ['Vegetable', 'Fruits', 'Commercial', 'Medicinal', 'Ornamental'],
 }
 
-PLANT_LIST = [
+# Row x usage-tag boolean matrix so the usage filter is a single column reduction
+USAGE_COLS = FILTER_OPTIONS['usage']
+USAGE_MATRIX = np.zeros((len(df), len(USAGE_COLS)), dtype=bool)
+_usage_tags = df['UsageTags'].explode().dropna()
+USAGE_MATRIX[
+    df.index.get_indexer(_usage_tags.index),
+    _usage_tags.map({u: i for i, u in enumerate(USAGE_COLS)}).to_numpy(dtype=int),
+] = True
+
+_plant_categories = get_plant_categories(df)
+_vegetable_flags = df['VegetableFlag'].astype(str).to_numpy()
+PLANT_LIST = pd.DataFrame(
     {
-        'name': row['Plant'],
-        'category': get_plant_category(row),
-        'vegetable': row['VegetableFlag'],
+        'name': df['Plant'].to_numpy(),
+        'category': _plant_categories,
+        'vegetable': _vegetable_flags,
     }
-    for _, row in df.iterrows()
-]
+).to_dict('records')
+
+# Lowercased names for substring search; PLANT_LIST has one entry per row, so positions line up
+LOWER_NAMES = df['Plant'].astype(str).str.lower().to_numpy(dtype=str)
+
+# Plant names repeat in the dataset: PLANT_CODES identifies the name of each row, and
+# PLANT_INDEX resolves a name to its first row like the old `.iloc[0]` lookups
+PLANT_ARR = df['Plant'].to_numpy()
+PLANT_CODES, PLANT_NAMES = pd.factorize(PLANT_ARR)
+_, _first_rows = np.unique(PLANT_CODES, return_index=True)
+PLANT_INDEX: dict[str, int] = dict(zip(PLANT_NAMES.tolist(), _first_rows.tolist()))
+
+# Adaptation tokens of all rows as one flat code array; row i owns
+# ADAPT_TOKEN_CODES[ADAPT_TOKEN_STARTS[i]:ADAPT_TOKEN_STARTS[i] + ADAPT_TOKEN_LENGTHS[i]]
+ADAPT_TOKEN_LENGTHS = df['AdaptTokens'].map(len).to_numpy(dtype=np.intp)
+ADAPT_TOKEN_STARTS = np.cumsum(ADAPT_TOKEN_LENGTHS) - ADAPT_TOKEN_LENGTHS
+ADAPT_TOKEN_CODES, ADAPT_TOKEN_LABELS = pd.factorize(
+    np.array(list(chain.from_iterable(df['AdaptTokens'])), dtype=object)
+)
+
+# Trait values per plant name for /api/compare; a repeated name shows its last row
+PLANT_TRAITS: dict[str, dict] = (
+    df.drop_duplicates('Plant', keep='last').set_index('Plant')[TRAIT_COLS].astype(str).to_dict(orient='index')
+)
+
+# Drought grouping follows the first row carrying each plant name
+_drought = df['Stress Tolerance'].astype(str).str.contains('drought', case=False, na=False).to_numpy()
+_drought = _drought[_first_rows[PLANT_CODES]]
+
+# One boolean row mask per grouping; groups without any plant are left out
+_category_masks = {category: _plant_categories == category for category in pd.unique(_plant_categories)}
+_category_masks['Edible'] = _vegetable_flags == 'Yes'
+_category_masks['Drought Tolerant'] = _drought
+CATEGORY_MAPPINGS: dict[str, list] = {
+    category: [PLANT_LIST[i] for i in np.flatnonzero(mask)]
+    for category, mask in _category_masks.items()
+    if mask.any()
+}
 
-CATEGORY_MAPPINGS: dict[str, list] = {}
-for plant in PLANT_LIST:
-    CATEGORY_MAPPINGS.setdefault(plant['category'], []).append(plant)
-    if plant['vegetable'] == 'Yes':
-        CATEGORY_MAPPINGS.setdefault('Edible', []).append(plant)
-    # Drought tolerant grouping
-    plant_row = df.loc[df['Plant'] == plant['name']]
-    if not plant_row.empty:
-        stress_val = str(plant_row.iloc[0]['Stress Tolerance']).lower()
-        if 'drought' in stress_val:
-            CATEGORY_MAPPINGS.setdefault('Drought Tolerant', []).append(plant)
+# Static payloads are serialized once at import
+FILTER_OPTIONS_JSON = _prepare_json(FILTER_OPTIONS)
+PLANT_LIST_JSON = _prepare_json(PLANT_LIST)
+CATEGORY_MAPPINGS_JSON = {category: _prepare_json(plants) for category, plants in CATEGORY_MAPPINGS.items()}
+EMPTY_LIST_JSON = _prepare_json([])
 
 
 # Encoders and clustering
-TRAIT_COLS = [
-    'Root',
-    'Type',
-    'Stem / Growth Form',
-    'Leaf Traits',
-    'Reproductive Traits',
-    'Stress Tolerance',
-    'Special Adaptations',
-    'VegetableFlag',
-]
-
-# Ensure string dtype for encoders
-_encoded_input = df[TRAIT_COLS].astype(str)
-ENCODERS = {col: LabelEncoder().fit(_encoded_input[col]) for col in TRAIT_COLS}
-ENCODED = pd.DataFrame({col: ENCODERS[col].transform(_encoded_input[col]) for col in TRAIT_COLS})
-
-pca = PCA(n_components=2, random_state=42)
-pca_result = pca.fit_transform(ENCODED)
-kmeans = KMeans(n_clusters=5, random_state=42)
-kmeans.fit(ENCODED)
-
-df['PCA1'], df['PCA2'] = pca_result[:, 0], pca_result[:, 1]
-df['Cluster'] = kmeans.labels_
+# Trait columns are already categorical; their codes match LabelEncoder output (categories are sorted)
+CATEGORY_MAPS = {col: df[col].cat.categories for col in TRAIT_COLS}
+# Codes are stored as one C-contiguous int16 matrix (rows = plants, columns = TRAIT_COLS);
+# the assert only guards the int16 storage, not the distance arithmetic below
+assert all(len(cats) <= np.iinfo(np.int16).max for cats in CATEGORY_MAPS.values())
+ENCODED_NP = np.ascontiguousarray(
+    np.column_stack([df[col].cat.codes.to_numpy() for col in TRAIT_COLS]), dtype=np.int16
+)
+
+# Float32 copy for PCA/KMeans; every int16 code converts exactly
+ENC_ARR = ENCODED_NP.astype(np.float32)
+# /api/similar expands |x - t|^2, which is exact only while each row's sum of squared codes
+# fits the mantissa: float64 covers that up to 2**53, far beyond what int16 codes can reach
+ENC_ARR64 = ENCODED_NP.astype(np.float64)
+ENC_SQNORMS = np.einsum('ij,ij->i', ENC_ARR64, ENC_ARR64)
+# Encoded values normalized to [0,1] per trait for /api/radar
+RADAR_VALUES = ENC_ARR64 / np.maximum(ENC_ARR64.max(axis=0), 1.0)
+
+pca = PCA(n_components=2, svd_solver='randomized', random_state=42)
+pca_result = pca.fit_transform(ENC_ARR)
+kmeans = MiniBatchKMeans(n_clusters=5, random_state=42, batch_size=256, n_init=3)
+kmeans.fit(ENC_ARR)
+
+df['PCA1'] = pca_result[:, 0].astype(np.float32)
+df['PCA2'] = pca_result[:, 1].astype(np.float32)
+df['Cluster'] = kmeans.labels_.astype(np.int8)
+
+# Cluster scatter columns, fitted once on the full dataset and sliced per filter set
+CLUSTER_POINTS = {
+    'plant': PLANT_ARR,
+    'pca1': df['PCA1'].to_numpy(),
+    'pca2': df['PCA2'].to_numpy(),
+    'cluster': df['Cluster'].to_numpy(),
+}
 
 
 # ------------------------------
@@ -234,146 +364,124 @@ def dashboard():
 
 @app.route('/api/filter-options')
 def filter_options():
-    return jsonify(FILTER_OPTIONS)
+    return _prepared_response(FILTER_OPTIONS_JSON)
 
 
 @app.route('/api/plant-list')
 def plant_list():
-    return jsonify(PLANT_LIST)
+    return _prepared_response(PLANT_LIST_JSON)
 
 
 @app.route('/api/plant-search')
 def plant_search():
     q = request.args.get('q', '').lower()
-    results = [plant for plant in PLANT_LIST if q in plant['name'].lower()]
-    return jsonify(results[:10])
+    if not q:
+        # Every name contains the empty string
+        return jsonify(PLANT_LIST[:10])
+    hits = np.flatnonzero(np.char.find(LOWER_NAMES, q) >= 0)[:10]
+    return jsonify([PLANT_LIST[i] for i in hits])
 
 
 @app.route('/api/plants-by-category')
 def plants_by_category():
     category = request.args.get('category', '')
-    return jsonify(CATEGORY_MAPPINGS.get(category, []))
+    return _prepared_response(CATEGORY_MAPPINGS_JSON.get(category, EMPTY_LIST_JSON))
 
 
 @app.route('/api/traits')
+@cached_json
 def get_traits():
-    filtered = apply_filters(df)
-    root_counts = filtered['Root'].value_counts().to_dict()
-    return jsonify({'root_counts': root_counts})
+    filtered = apply_filters()
+    root_counts = _category_counts(filtered['Root'])
+    return {'root_counts': root_counts}
 
 
 @app.route('/api/wordcloud')
+@cached_json
 def get_wordcloud():
-    filtered = apply_filters(df)
-    # Tokenize special adaptations by words and semicolons
-    text = ' '.join(filtered['Special Adaptations'].astype(str).tolist()).lower()
-    # Split by non-word or semicolons/commas
-    tokens = [t for t in re.split(r"[^a-zA-Z0-9]+", text) if len(t) > 2 and t != 'unknown']
-    counts = Counter(tokens)
+    filtered = apply_filters()
+    # Tokenize each cell into alphanumeric words of 3+ characters, without joining the column
+    counts = Counter()
+    for cell in filtered['LoweredAdapt'].to_numpy():
+        counts.update(t for t in _TOKEN_RE.findall(cell) if t not in _STOP_TOKENS)
     top = counts.most_common(50)
-    return jsonify({'terms': [t for t, _ in top], 'counts': [c for _, c in top]})
+    return {'terms': [t for t, _ in top], 'counts': [c for _, c in top]}
 
 
 @app.route('/api/sunburst')
+@cached_json
 def get_sunburst():
-    filtered = apply_filters(df)
+    filtered = apply_filters()
     labels = ['All']
     parents = ['']
     values = [len(filtered)]
 
-    # Level 1: Growth Form
-    gf_counts = filtered['Stem / Growth Form'].value_counts()
-    gf_index = {}
-    for gf, cnt in gf_counts.items():
-        gf_index[gf] = len(labels)
-        labels.append(str(gf))
-        parents.append('All')
-        values.append(int(cnt))
+    # Level 1: Growth Form, most frequent first (value_counts order; ties keep category order)
+    gf_counts = _category_counts(filtered['Stem / Growth Form'])
+    gf_counts = dict(sorted(gf_counts.items(), key=lambda item: -item[1]))
+    labels.extend(gf_counts.keys())
+    parents.extend(['All'] * len(gf_counts))
+    values.extend(gf_counts.values())
 
     # Level 2: Leaf Traits under each Growth Form
     grouped = (
-        filtered.groupby(['Stem / Growth Form', 'Leaf Traits'])['Plant']
-        .count()
+        filtered.groupby(['Stem / Growth Form', 'Leaf Traits'], sort=False, observed=True)
+        .size()
         .reset_index(name='count')
     )
-    lt_index = {}
-    for _, row in grouped.iterrows():
-        key = (row['Stem / Growth Form'], row['Leaf Traits'])
-        lt_index[key] = len(labels)
-        labels.append(str(row['Leaf Traits']))
-        parents.append(str(row['Stem / Growth Form']))
-        values.append(int(row['count']))
+    labels.extend(grouped['Leaf Traits'].astype(str).tolist())
+    parents.extend(grouped['Stem / Growth Form'].astype(str).tolist())
+    values.extend(grouped['count'].astype(int).tolist())
 
     # Level 3: Plants under each (GF, Leaf Trait)
-    for _, row in filtered.iterrows():
-        key = (row['Stem / Growth Form'], row['Leaf Traits'])
-        parent_label = str(row['Leaf Traits'])
-        labels.append(str(row['Plant']))
-        parents.append(parent_label)
-        values.append(1)
+    labels.extend(filtered['Plant'].astype(str).tolist())
+    parents.extend(filtered['Leaf Traits'].astype(str).tolist())
+    values.extend([1] * len(filtered))
 
-    return jsonify({'labels': labels, 'parents': parents, 'values': values})
+    return {'labels': labels, 'parents': parents, 'values': values}
 
 
 @app.route('/api/stress')
+@cached_json
 def get_stress():
-    filtered = apply_filters(df)
-    stress_counts = filtered['Stress Tolerance'].value_counts().to_dict()
-    return jsonify({'stress_counts': stress_counts})
+    filtered = apply_filters()
+    stress_counts = _category_counts(filtered['Stress Tolerance'])
+    return {'stress_counts': stress_counts}
 
 
 @app.route('/api/adaptations')
+@cached_json
 def get_adaptations():
-    filtered = apply_filters(df)
+    filtered = apply_filters()
     records = []
-    for _, row in filtered.iterrows():
-        adaptations = str(row['Special Adaptations'])
+    for plant, adaptations, vegetable in zip(
+        filtered['Plant'].to_numpy(),
+        filtered['Special Adaptations'].astype(str).to_numpy(),
+        filtered['VegetableFlag'].to_numpy(),
+    ):
         if adaptations and adaptations.lower() != 'unknown':
             records.append(
                 {
-                    'plant': row['Plant'],
+                    'plant': plant,
                     'adaptations': adaptations,
-                    'vegetable': row['VegetableFlag'],
+                    'vegetable': vegetable,
                 }
             )
-    return jsonify({'items': records})
+    return {'items': records}
 
 
 @app.route('/api/sankey')
+@cached_json
 def get_sankey():
-    filtered = apply_filters(df)
+    index = _filtered_index(_filter_key())
+    filtered = df.take(index)
     # Build nodes: stress categories, adaptation tokens, plants
-    stress_values = sorted(filtered['Stress Tolerance'].dropna().unique().tolist())
-
-    # Extract adaptation tokens
-    def split_adaptations(text: str) -> list[str]:
-        parts = re.split(r'[;,/]\s*', str(text))
-        return [p.strip() for p in parts if p and p.lower() != 'unknown']
-
-    adaptation_tokens = set()
-    for val in filtered['Special Adaptations']:
-        adaptation_tokens.update(split_adaptations(val))
-
-    # Limit to avoid extremely large diagrams
-    if len(adaptation_tokens) > 40:
-        # Take top 40 by frequency
-        counts = Counter(
-            token for val in filtered['Special Adaptations'] for token in split_adaptations(val)
-        )
-        adaptation_tokens = set([t for t, _ in counts.most_common(40)])
-
-    nodes = []
-    index_map = {}
+    # Categories are sorted, so the observed ones come out in sorted order
+    stress_values = list(_category_counts(filtered['Stress Tolerance']))
 
-    # Add stress nodes
-    for s in stress_values:
-        index_map[('stress', s)] = len(nodes)
-        nodes.append(str(s))
-
-    # Add adaptation nodes
-    for a in sorted(adaptation_tokens):
-        index_map[('adapt', a)] = len(nodes)
-        nodes.append(a)
+    # All adaptation tokens, limited to the top 40 by frequency to avoid extremely large diagrams
+    adaptation_tokens = set(_top_adapt_tokens(index, 40))
+    adapt_values = sorted(adaptation_tokens)
 
     # Add plant nodes (limit total to 150 to keep diagram responsive)
     plants = filtered['Plant'].tolist()
@@ -383,32 +491,31 @@ def get_sankey():
     else:
         filtered_subset = filtered
 
-    for p in plants:
-        index_map[('plant', p)] = len(nodes)
-        nodes.append(p)
-
-    sources = []
-    targets = []
-    values = []
-
-    for _, row in filtered_subset.iterrows():
-        stress = row['Stress Tolerance']
-        s_idx = index_map.get(('stress', stress))
-        for a in split_adaptations(row['Special Adaptations']):
-            if ('adapt', a) not in index_map:
-                continue
-            a_idx = index_map[('adapt', a)]
-            p_idx = index_map.get(('plant', row['Plant']))
-            # stress -> adaptation
-            sources.append(s_idx)
-            targets.append(a_idx)
-            values.append(1)
-            # adaptation -> plant
-            sources.append(a_idx)
-            targets.append(p_idx)
-            values.append(1)
-
-    return jsonify({'nodes': nodes, 'links': {'source': sources, 'target': targets, 'value': values}})
+    # Node ids are contiguous ranges: stress, then adaptations, then plants
+    nodes = [str(s) for s in stress_values] + adapt_values + plants
+    adapt_offset = len(stress_values)
+    plant_offset = adapt_offset + len(adapt_values)
+    # A repeated plant name links to its last node
+    plant_node = {p: plant_offset + i for i, p in enumerate(plants)}
+    plant_node_ids = np.fromiter(plant_node.values(), dtype=np.int64, count=len(plant_node))
+
+    # One row per (plant, adaptation) pair, in row then token order
+    pairs = filtered_subset[['Plant', 'Stress Tolerance', 'AdaptTokens']].explode('AdaptTokens')
+    pairs = pairs[pairs['AdaptTokens'].isin(adaptation_tokens)]
+    s_idx = pd.Index(stress_values).get_indexer(pairs['Stress Tolerance'].astype(str))
+    a_idx = adapt_offset + pd.Index(adapt_values).get_indexer(pairs['AdaptTokens'])
+    p_idx = plant_node_ids[pd.Index(list(plant_node)).get_indexer(pairs['Plant'])]
+
+    # Interleave stress -> adaptation and adaptation -> plant links
+    sources = np.empty(2 * len(pairs), dtype=np.int64)
+    targets = np.empty(2 * len(pairs), dtype=np.int64)
+    sources[0::2], targets[0::2] = s_idx, a_idx
+    sources[1::2], targets[1::2] = a_idx, p_idx
+    sources = sources.tolist()
+    targets = targets.tolist()
+    values = [1] * len(sources)
+
+    return {'nodes': nodes, 'links': {'source': sources, 'target': targets, 'value': values}}
 
 
 @app.route('/api/compare')
@@ -416,23 +523,8 @@ def compare_plants():
     selected = _parse_list_arg('plants')
     if not selected:
         return jsonify({'plants': [], 'traits': [], 'values': {}})
-    rows = df[df['Plant'].isin(selected)]
-    traits = [
-        'Root',
-        'Type',
-        'Stem / Growth Form',
-        'Leaf Traits',
-        'Reproductive Traits',
-        'Stress Tolerance',
-        'Special Adaptations',
-        'VegetableFlag',
-    ]
-    values = {plant: {} for plant in selected}
-    for _, row in rows.iterrows():
-        plant = row['Plant']
-        for t in traits:
-            values[plant][t] = str(row[t])
-    return jsonify({'plants': selected, 'traits': traits, 'values': values})
+    values = {plant: PLANT_TRAITS.get(plant, {}) for plant in selected}
+    return jsonify({'plants': selected, 'traits': TRAIT_COLS, 'values': values})
 
 
 @app.route('/api/radar')
@@ -440,105 +532,89 @@ def radar_data():
     selected = _parse_list_arg('plants')
     if not selected:
         return jsonify({'categories': [], 'series': []})
-    # Normalize encoded values to [0,1] per trait
-    categories = TRAIT_COLS
-    encoded_rows = ENCODED.copy()
-    encoded_rows['Plant'] = df['Plant']
-    subset = encoded_rows[encoded_rows['Plant'].isin(selected)]
-    maxima = {c: max(1, encoded_rows[c].max()) for c in TRAIT_COLS}
-    series = []
-    for plant in selected:
-        prow = subset[subset['Plant'] == plant]
-        if prow.empty:
-            continue
-        values = [float(prow.iloc[0][c]) / float(maxima[c]) for c in TRAIT_COLS]
-        series.append({'name': plant, 'values': values})
-    return jsonify({'categories': categories, 'series': series})
+    # Gather the precomputed [0,1] profile of each selected plant's first row
+    names = [plant for plant in selected if plant in PLANT_INDEX]
+    values = RADAR_VALUES[[PLANT_INDEX[plant] for plant in names]].tolist()
+    series = [{'name': name, 'values': row} for name, row in zip(names, values)]
+    return jsonify({'categories': TRAIT_COLS, 'series': series})
 
 
 @app.route('/api/similar')
 def similar_plants():
     plant = request.args.get('plant', '')
-    if not plant or plant not in set(df['Plant'].tolist()):
+    if not plant or plant not in PLANT_INDEX:
         return jsonify({'similar': []})
-    # Distance in encoded feature space (Euclidean)
-    encoded_rows = ENCODED.copy()
-    encoded_rows['Plant'] = df['Plant']
-    target = encoded_rows[encoded_rows['Plant'] == plant].iloc[0]
-    sims = []
-    for _, row in encoded_rows.iterrows():
-        other = row['Plant']
-        if other == plant:
-            continue
-        dist = 0.0
-        for c in TRAIT_COLS:
-            d = float(row[c]) - float(target[c])
-            dist += d * d
-        sims.append((math.sqrt(dist), other))
-    sims.sort(key=lambda x: x[0])
-    return jsonify({'similar': [name for _, name in sims[:10]]})
+    # Squared Euclidean distance in encoded feature space; rows sharing the name are excluded
+    # |x - t|^2 = |x|^2 - 2 x.t + |t|^2: one matrix-vector product, no N x F temporary
+    i = PLANT_INDEX[plant]
+    d2 = ENC_SQNORMS - 2 * (ENC_ARR64 @ ENC_ARR64[i]) + ENC_SQNORMS[i]
+    rows = np.flatnonzero(PLANT_CODES != PLANT_CODES[i])
+    d2 = d2[rows]
+    if len(rows) > 10:
+        # Linear-time cut to the 10 nearest (plus ties), then order just those
+        cutoff = np.partition(d2, 9)[9]
+        keep = d2 <= cutoff
+        rows, d2 = rows[keep], d2[keep]
+    order = rows[np.argsort(d2, kind='stable')[:10]]
+    return jsonify({'similar': PLANT_ARR[order].tolist()})
 
 
 @app.route('/api/network')
+@cached_json
 def trait_network():
-    filtered = apply_filters(df)
+    index = _filtered_index(_filter_key())
+    filtered = df.take(index)
     # Build bipartite graph: plants <-> traits (root type, growth form, stress, key adaptations)
-    nodes = []
-    node_index = {}
-
-    def add_node(node_id: str, label: str, group: str):
-        if node_id in node_index:
-            return node_index[node_id]
-        idx = len(nodes)
-        node_index[node_id] = idx
-        nodes.append({'id': node_id, 'label': label, 'group': group})
-        return idx
+    # Each node group is factorized over precomputed integer codes (no string hashing) and
+    # node ids are offset per group
+    plant_codes, plant_uniques = pd.factorize(PLANT_CODES[index])
+    nodes = [{'id': f'p::{p}', 'label': p, 'group': 'plant'} for p in PLANT_NAMES[plant_uniques].tolist()]
+    sources = []
+    targets = []
 
-    links = []
+    def add_group(prefix: str, group: str, rows: np.ndarray, codes: np.ndarray, labels: pd.Index):
+        local_codes, uniques = pd.factorize(codes)
+        offset = len(nodes)
+        nodes.extend({'id': prefix + v, 'label': v, 'group': group} for v in labels[uniques].tolist())
+        sources.append(plant_codes[rows])
+        targets.append(offset + local_codes)
+
+    all_rows = np.arange(len(filtered))
+    for col, prefix, group in [
+        ('Root', 'rt::', 'Root'),
+        ('Type', 'ty::', 'Type'),
+        ('Stem / Growth Form', 'gf::', 'Growth Form'),
+        ('Stress Tolerance', 'st::', 'Stress Tolerance'),
+    ]:
+        add_group(prefix, group, all_rows, filtered[col].cat.codes.to_numpy(), CATEGORY_MAPS[col])
 
     # Collect top adaptation tokens to limit size
-    def split_adaptations(text: str) -> list[str]:
-        parts = re.split(r'[;,/]\s*', str(text))
-        return [p.strip() for p in parts if p and p.lower() != 'unknown']
-
-    adapt_counter = Counter(
-        token for val in filtered['Special Adaptations'] for token in split_adaptations(val)
-    )
-    top_adapts = {t for t, _ in adapt_counter.most_common(30)}
-
-    for _, row in filtered.iterrows():
-        plant = row['Plant']
-        p_idx = add_node(f'p::{plant}', plant, 'plant')
-        traits = [
-            ('rt::' + row['Root'], row['Root'], 'Root'),
-            ('ty::' + row['Type'], row['Type'], 'Type'),
-            ('gf::' + row['Stem / Growth Form'], row['Stem / Growth Form'], 'Growth Form'),
-            ('st::' + row['Stress Tolerance'], row['Stress Tolerance'], 'Stress Tolerance'),
-        ]
-        for node_id, label, group in traits:
-            t_idx = add_node(node_id, label, group)
-            links.append({'source': p_idx, 'target': t_idx})
+    top_adapts = set(_top_adapt_tokens(index, 30))
+    exploded = filtered['AdaptTokens'].reset_index(drop=True).explode().dropna()
+    exploded = exploded[exploded.isin(top_adapts)]
+    token_codes, token_labels = pd.factorize(exploded)
+    add_group('ad::', 'Adaptation', exploded.index.to_numpy(dtype=np.intp), token_codes, token_labels)
 
-        for a in split_adaptations(row['Special Adaptations']):
-            if a in top_adapts:
-                a_idx = add_node('ad::' + a, a, 'Adaptation')
-                links.append({'source': p_idx, 'target': a_idx})
+    # Columnar links, same layout as /api/sankey: no per-link dict to build or serialize
+    links = {'source': np.concatenate(sources).tolist(), 'target': np.concatenate(targets).tolist()}
 
-    return jsonify({'nodes': nodes, 'links': links})
+    return {'nodes': nodes, 'links': links}
 
 
 @app.route('/api/vegetables')
+@cached_json
 def get_vegetables():
-    filtered = apply_filters(df)
-    veg_counts = filtered['VegetableFlag'].value_counts().to_dict()
-    return jsonify({'veg_counts': veg_counts})
+    filtered = apply_filters()
+    veg_counts = _category_counts(filtered['VegetableFlag'])
+    return {'veg_counts': veg_counts}
 
 
 @app.route('/api/clusters')
+@cached_json
 def get_clusters():
-    filtered = apply_filters(df)
-    points = filtered[['Plant', 'PCA1', 'PCA2', 'Cluster']].to_dict('records')
-    return jsonify({'points': points})
+    # Columnar payload gathered straight from the precomputed arrays, without taking a filtered frame
+    index = _filtered_index(_filter_key())
+    return {field: values[index].tolist() for field, values in CLUSTER_POINTS.items()}
 
 
 if __name__ == '__main__':
@@ -260,11 +260,11 @@ async function loadClusterChart() {
     const res = await fetch('/api/clusters');
     const data = await res.json();
     const clusters = {};
-    data.points.forEach(p => {
-        clusters[p.Cluster] = clusters[p.Cluster] || {x: [], y: [], text: [], name: `Cluster ${p.Cluster}`};
-        clusters[p.Cluster].x.push(p.PCA1);
-        clusters[p.Cluster].y.push(p.PCA2);
-        clusters[p.Cluster].text.push(p.Plant);
+    data.cluster.forEach((c, i) => {
+        clusters[c] = clusters[c] || {x: [], y: [], text: [], name: `Cluster ${c}`};
+        clusters[c].x.push(data.pca1[i]);
+        clusters[c].y.push(data.pca2[i]);
+        clusters[c].text.push(data.plant[i]);
     });
     const traces = Object.values(clusters).map(c => ({...c, mode: 'markers', type: 'scatter'}));
     Plotly.newPlot('clusterChart', traces, {title: 'PCA Clusters'});